@@ -3,13 +3,19 @@ import sys
 import tkinter as tk
 import zipfile
 import socket
+import select
 import threading
 import webbrowser
 import uuid
+import collections
+import time
+import http.client
 import http.server
 import socketserver
+import urllib.parse
 import customtkinter as ctk
 from pathlib import Path
+from http import HTTPStatus
 from tkinter import filedialog, messagebox
 from typing import Dict, List, Optional, Tuple
 import json
@@ -20,6 +26,25 @@ ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("./resources/themes/yellow.json")
 
 SETTINGS_PATH = os.path.join(os.path.expanduser("~"), ".locally", "settings.json")
+PROFILES_DIR = os.path.join(os.path.expanduser("~"), ".locally", "profiles")
+
+# Headers that only apply to a single connection and must not be forwarded by the proxy
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+                      "proxy-connection", "te", "trailer", "trailers", "transfer-encoding", "upgrade"}
+# Idle upstream connections older than this are dropped instead of reused (gunicorn closes after 2s)
+PROXY_IDLE_TIMEOUT = 1.5
+PROXY_CHUNK_SIZE = 64 * 1024
+
+def _hop_by_hop_headers(connection_values: Optional[List[str]]) -> set:
+    # Standard hop-by-hop headers plus any the peer listed in its Connection header
+    names = set(HOP_BY_HOP_HEADERS)
+    for value in connection_values or []:
+        names.update(token.strip().lower() for token in value.split(",") if token.strip())
+    return names
+
+class MalformedRequestError(ValueError):
+    # A client request body the proxy can't parse; answered with 400 rather than blamed on the upstream
+    pass
 
 class Settings:
     # Application settings storage and management
@@ -33,6 +58,9 @@ class Settings:
         self.server_timeout = 60
         self.cors_enabled = False
         self.cors_origins = "*"
+        self.proxy_timeout = 30
+        self.proxy_pool_size = 8
+        self.proxy_health_interval = 10
         self.appearance_mode = "System"
         self.ui_scaling = 1.0
         self.font_size = 12
@@ -57,6 +85,321 @@ class Settings:
             with open(SETTINGS_PATH, "r") as f:
                 self.from_dict(json.load(f))
 
+class UpstreamPool:
+    # Bounded keep-alive connection pool and health checker for one proxy upstream
+    def __init__(self, scheme: str, host: str, port: int, max_connections: int = 8, timeout: float = 30,
+                 health_interval: float = 10):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.netloc = f"{self.host}:{self.port}"
+        # A zero timeout would make the sockets non-blocking, so treat it as "no timeout"
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.health_interval = health_interval
+        self.healthy = True
+        self._idle: List[Tuple[http.client.HTTPConnection, float]] = []
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, max_connections))
+        self._closed = threading.Event()
+        self._health_thread = None
+
+    def start_health_checks(self):
+        # Start the background health probe for this upstream
+        if self.health_interval and self.health_interval > 0:
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+
+    def _health_loop(self):
+        # Periodically probe the upstream until the pool is closed
+        while not self._closed.is_set():
+            self.healthy = self.check_health()
+            self._closed.wait(self.health_interval)
+
+    def check_health(self) -> bool:
+        # Probe the upstream with a plain TCP connect so no pooled socket is used up
+        try:
+            with socket.create_connection((self.host, self.port), timeout=min(self.timeout or 5, 5)):
+                return True
+        except OSError:
+            return False
+
+    def is_available(self) -> bool:
+        # Fail fast while the upstream is down, but re-probe on demand so a backend that
+        # comes back up doesn't have to wait for the next scheduled health check
+        if self.healthy or self._health_thread is None:
+            return True
+        if self._probe_lock.acquire(blocking=False):
+            try:
+                self.healthy = self.check_health()
+            finally:
+                self._probe_lock.release()
+        return self.healthy
+
+    @staticmethod
+    def _is_reusable(conn: http.client.HTTPConnection) -> bool:
+        # An idle socket that is readable has either been closed by the upstream or holds stray data
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    def acquire(self, fresh: bool = False) -> Tuple[http.client.HTTPConnection, bool]:
+        # Borrow a live idle connection or open a new one, waiting for a free slot
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No free connection to {self.netloc}")
+        if not fresh:
+            now = time.monotonic()
+            conn, stale = None, []
+            with self._lock:
+                while self._idle:
+                    candidate, last_used = self._idle.pop()
+                    if now - last_used < PROXY_IDLE_TIMEOUT and self._is_reusable(candidate):
+                        conn = candidate
+                        break
+                    stale.append(candidate)
+            for candidate in stale:
+                candidate.close()
+            if conn is not None:
+                return conn, True
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout), False
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool = True):
+        # Return a connection to the pool, closing it if it can't be reused
+        if reusable and not self._closed.is_set():
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        else:
+            conn.close()
+        self._slots.release()
+
+    def request(self, method: str, url: str, headers: List[Tuple[str, str]], body=None, chunked: bool = False):
+        # Send a request upstream, streaming the body chunks; if a pooled connection turns out
+        # to be stale before any body was read, retry once on a freshly opened connection
+        body_iter = iter(body or ())
+        body_started = False
+        for attempt in range(2):
+            conn, reused = self.acquire(fresh=attempt > 0)
+            try:
+                conn.putrequest(method, url, skip_host=True, skip_accept_encoding=True)
+                for name, value in headers:
+                    conn.putheader(name, value)
+                conn.endheaders()
+                for chunk in body_iter:
+                    body_started = True
+                    conn.send(b"%x\r\n%s\r\n" % (len(chunk), chunk) if chunked else chunk)
+                if chunked:
+                    conn.send(b"0\r\n\r\n")
+                response = conn.getresponse()
+                self.healthy = True
+                return conn, response
+            except BaseException as e:
+                self.release(conn, reusable=False)
+                if reused and not body_started and isinstance(e, (OSError, http.client.HTTPException)):
+                    continue
+                if isinstance(e, ConnectionRefusedError):
+                    self.healthy = False
+                raise
+
+    def close(self):
+        # Stop health checks and close all idle connections
+        self._closed.set()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+class TokenBucket:
+    # Thread-safe token bucket; consume() sleeps until the requested tokens are paid back
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        # Take tokens, going into debt if needed so concurrent callers queue fairly
+        with self._lock:
+            if self.rate <= 0:
+                return
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+    def set_rate(self, rate: float):
+        # Change the refill rate and burst size, keeping any tokens already earned; 0 disables throttling
+        with self._lock:
+            self.rate = rate
+            self.capacity = rate
+            self.tokens = min(self.tokens, self.capacity)
+
+class _ThrottledWriter:
+    # Wraps a handler's wfile so every write is paced by the client's current token bucket
+    def __init__(self, raw, server: "ThrottledTCPServer", client_ip: str):
+        self.raw = raw
+        self.server = server
+        self.client_ip = client_ip
+
+    def write(self, data) -> int:
+        # Look the bucket up per write so limit changes reach connections that are already open
+        bucket = self.server.get_bucket(self.client_ip)
+        if bucket is None:
+            return self.raw.write(data)
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            size = 16 * 1024
+            if bucket.rate > 0:
+                size = max(1, min(int(bucket.capacity), size))
+            piece = view[offset:offset + size]
+            bucket.consume(len(piece))
+            self.raw.write(piece)
+            offset += len(piece)
+        return len(view)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+class ThrottledTCPServer(socketserver.ThreadingTCPServer):
+    # Threaded site server with a connection cap and per-client bandwidth limit
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler, max_connections: int = 0, bandwidth_limit: int = 0):
+        super().__init__(server_address, handler)
+        self.max_connections = max_connections
+        self.active_connections = 0
+        self.bandwidth_limit = bandwidth_limit
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._serving_threads = set()
+        self._lock = threading.Lock()
+
+    def get_bucket(self, client_ip: str) -> Optional[TokenBucket]:
+        # Get the token bucket shared by all connections from one client
+        if self.bandwidth_limit <= 0:
+            return None
+        with self._lock:
+            if client_ip not in self._buckets:
+                self._buckets[client_ip] = TokenBucket(self.bandwidth_limit)
+            return self._buckets[client_ip]
+
+    def set_limits(self, max_connections: int, bandwidth_limit: int):
+        # Update the limits of the running server; open connections pick up the new rate
+        with self._lock:
+            self.max_connections = max_connections
+            self.bandwidth_limit = bandwidth_limit
+            for bucket in self._buckets.values():
+                bucket.set_rate(bandwidth_limit)
+            if bandwidth_limit <= 0:
+                self._buckets.clear()
+
+    def serving_thread_ids(self) -> List[int]:
+        # Thread idents currently handling a connection
+        with self._lock:
+            return list(self._serving_threads)
+
+    def _release_connection(self):
+        with self._lock:
+            self.active_connections -= 1
+
+    def process_request(self, request, client_address):
+        # Refuse connections over the cap with a 503 before any handler thread is started
+        with self._lock:
+            accepted = self.max_connections <= 0 or self.active_connections < self.max_connections
+            if accepted:
+                self.active_connections += 1
+        if not accepted:
+            try:
+                request.sendall(b"HTTP/1.0 503 Service Unavailable\r\nRetry-After: 1\r\n"
+                                b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._release_connection()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        # Track the thread for the profiler and free its connection slot when done
+        ident = threading.get_ident()
+        with self._lock:
+            self._serving_threads.add(ident)
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self._lock:
+                self._serving_threads.discard(ident)
+            self._release_connection()
+
+class SiteProfiler:
+    # Samples the stacks of a site's serving threads and saves them as collapsed stacks
+    def __init__(self, server: ThrottledTCPServer, output_path: str, duration: float, interval: float = 0.01):
+        self.server = server
+        self.output_path = output_path
+        self.duration = duration
+        self.interval = interval
+        self.samples = 0
+        self.error = None
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        # Stop sampling early and wait for the output file to be written
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        # Sample until the duration elapses or stop() is called, then save
+        deadline = time.monotonic() + self.duration
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            self._sample()
+            self._stop.wait(self.interval)
+        self._write()
+
+    def _sample(self):
+        # Record one stack per serving thread, root frame first
+        frames = sys._current_frames()
+        for ident in self.server.serving_thread_ids():
+            frame = frames.get(ident)
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _write(self):
+        # Save stacks in the collapsed format read by flamegraph.pl and speedscope
+        try:
+            os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            self.error = e
+
 class WebSite:
     # Represents a locally hosted website and its server
     def __init__(self, name: str, path: str, port: int = None, hostname: str = "localhost", settings: Settings = None):
@@ -69,6 +412,11 @@ class WebSite:
         self.server = None
         self.is_running = False
         self.id = str(uuid.uuid4())[:8]
+        self.proxy_rules: List[Tuple[str, str]] = []
+        self.upstream_pools: Dict[Tuple[str, str, int], UpstreamPool] = {}
+        self.max_connections = 0
+        self.bandwidth_limit = 0
+        self.profiler: Optional[SiteProfiler] = None
         
     def _find_free_port(self) -> int:
         # Find a free port for the web server
@@ -84,7 +432,54 @@ class WebSite:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.bind(('', 0))
             return s.getsockname()[1]
-    
+
+    @staticmethod
+    def parse_proxy_rules(spec: str) -> List[Tuple[str, str]]:
+        # Parse "prefix=host:port" rules separated by commas, e.g. "/api/*=127.0.0.1:5000"
+        rules = []
+        for item in spec.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            prefix, sep, target = item.partition("=")
+            prefix, target = prefix.strip(), target.strip()
+            if not sep or not prefix.startswith("/") or not target:
+                raise ValueError(f"Invalid proxy rule: {item!r}")
+            WebSite.parse_proxy_target(target)
+            rules.append((prefix, target))
+        return rules
+
+    @staticmethod
+    def parse_proxy_target(target: str) -> Tuple[str, str, int, str]:
+        # Split a proxy target such as "127.0.0.1:5000/v1" into scheme, host, port and base path
+        try:
+            parsed = urllib.parse.urlsplit(target if "://" in target else f"http://{target}")
+            scheme = parsed.scheme or "http"
+            port = parsed.port or (443 if scheme == "https" else 80)
+        except ValueError:
+            raise ValueError(f"Invalid proxy target: {target!r}")
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Invalid proxy target: {target!r}")
+        return scheme, parsed.hostname or "127.0.0.1", port, parsed.path.rstrip("/")
+
+    def _create_proxy_routes(self) -> List[Tuple[str, str, UpstreamPool]]:
+        # Build (prefix, base path, pool) routes, longest prefix first, sharing one pool per upstream
+        timeout, pool_size, health_interval = 30, 8, 10
+        if self.settings:
+            timeout = self.settings.proxy_timeout
+            pool_size = self.settings.proxy_pool_size
+            health_interval = self.settings.proxy_health_interval
+        routes = []
+        for prefix, target in self.proxy_rules:
+            scheme, host, port, base_path = self.parse_proxy_target(target)
+            key = (scheme, host, port)
+            if key not in self.upstream_pools:
+                self.upstream_pools[key] = UpstreamPool(scheme, host, port, max_connections=pool_size,
+                                                        timeout=timeout, health_interval=health_interval)
+            routes.append((prefix.rstrip("*").rstrip("/"), base_path, self.upstream_pools[key]))
+        routes.sort(key=lambda item: len(item[0]), reverse=True)
+        return routes
+
     def start(self) -> bool:
         # Start the web server for this site
         if self.is_running:
@@ -93,7 +488,14 @@ class WebSite:
         parent_app = None
         if hasattr(self, 'settings') and hasattr(self.settings, 'parent_app'):
             parent_app = self.settings.parent_app
+        server_timeout = self.settings.server_timeout if self.settings else None
         class LoggingHandler(http.server.SimpleHTTPRequestHandler):
+            timeout = server_timeout or None
+
+            def setup(self):
+                super().setup()
+                self.wfile = _ThrottledWriter(self.wfile, self.server, self.client_address[0])
+
             def log_message(self, format, *args):
                 msg = "%s - - [%s] %s\n" % (
                     self.client_address[0],
@@ -105,16 +507,145 @@ class WebSite:
                 else:
                     with open(f"site_{self.server.site_id}.log", "a", encoding="utf-8") as f:
                         f.write(msg)
+
+            def _proxy_route(self) -> Optional[Tuple[str, UpstreamPool]]:
+                # Find the route whose prefix matches the request path
+                path = urllib.parse.urlsplit(self.path).path
+                for prefix, base_path, pool in self.server.proxy_routes:
+                    if path == prefix or path.startswith(prefix + "/"):
+                        return base_path, pool
+                return None
+
+            def _read_body(self, length: int):
+                # Yield a Content-Length request body from the client as it arrives
+                while length > 0:
+                    data = self.rfile.read(min(PROXY_CHUNK_SIZE, length))
+                    if not data:
+                        raise ConnectionError("Client closed the connection mid-request")
+                    length -= len(data)
+                    yield data
+
+            def _read_chunked(self):
+                # Decode a chunked request body from the client, yielding data as it arrives
+                while True:
+                    line = self.rfile.readline(65537)
+                    try:
+                        size = int(line.split(b";", 1)[0].strip(), 16)
+                    except ValueError:
+                        raise MalformedRequestError("Malformed chunked request body")
+                    if size < 0:
+                        raise MalformedRequestError("Malformed chunked request body")
+                    if size == 0:
+                        break
+                    yield from self._read_body(size)
+                    if self.rfile.readline(3) not in (b"\r\n", b"\n"):
+                        raise MalformedRequestError("Malformed chunked request body")
+                while self.rfile.readline(65537) not in (b"\r\n", b"\n", b""):
+                    pass
+
+            def _proxy(self, base_path: str, pool: UpstreamPool):
+                # Forward the request to the upstream and stream the response back
+                url = base_path + self.path
+                if not url.isascii() or any(c <= " " or c == "\x7f" for c in url):
+                    self.send_error(HTTPStatus.BAD_REQUEST, "Path can't be forwarded upstream")
+                    return
+                if not pool.is_available():
+                    self.send_error(HTTPStatus.BAD_GATEWAY, f"Upstream {pool.netloc} is down")
+                    return
+                chunked = "chunked" in self.headers.get("Transfer-Encoding", "").lower()
+                try:
+                    length = 0 if chunked else int(self.headers.get("Content-Length") or 0)
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    self.send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+                    return
+                skip = _hop_by_hop_headers(self.headers.get_all("Connection")) | {"host", "x-forwarded-for"}
+                if chunked:
+                    skip.add("content-length")
+                headers = [(name, value) for name, value in self.headers.items() if name.lower() not in skip]
+                forwarded_for = ", ".join((self.headers.get_all("X-Forwarded-For") or []) + [self.client_address[0]])
+                headers += [("Host", pool.netloc), ("X-Forwarded-For", forwarded_for)]
+                if "X-Forwarded-Host" not in self.headers:
+                    headers.append(("X-Forwarded-Host", self.headers.get("Host", "")))
+                if "X-Forwarded-Proto" not in self.headers:
+                    headers.append(("X-Forwarded-Proto", "http"))
+                if chunked:
+                    headers.append(("Transfer-Encoding", "chunked"))
+                    body = self._read_chunked()
+                else:
+                    body = self._read_body(length) if length else None
+                try:
+                    conn, response = pool.request(self.command, url, headers, body, chunked)
+                except (MalformedRequestError, http.client.InvalidURL, UnicodeError) as e:
+                    self.send_error(HTTPStatus.BAD_REQUEST, f"Request can't be forwarded upstream: {e}")
+                    return
+                except (OSError, http.client.HTTPException) as e:
+                    self.send_error(HTTPStatus.BAD_GATEWAY, f"Upstream {pool.netloc} unavailable: {e}")
+                    return
+                reusable = False
+                try:
+                    self.log_request(response.status)
+                    self.send_response_only(response.status, response.reason)
+                    response_skip = _hop_by_hop_headers(response.msg.get_all("Connection"))
+                    for name, value in response.getheaders():
+                        if name.lower() not in response_skip:
+                            self.send_header(name, value)
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    while True:
+                        chunk = response.read1(PROXY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        self.wfile.write(chunk)
+                    reusable = not response.will_close
+                except (OSError, http.client.HTTPException):
+                    self.close_connection = True
+                finally:
+                    response.close()
+                    pool.release(conn, reusable)
+
+            def do_GET(self):
+                route = self._proxy_route()
+                if route:
+                    self._proxy(*route)
+                else:
+                    super().do_GET()
+
+            def do_HEAD(self):
+                route = self._proxy_route()
+                if route:
+                    self._proxy(*route)
+                else:
+                    super().do_HEAD()
+
+            def _proxy_only(self):
+                # Methods the static file server doesn't handle are only valid on proxy routes
+                route = self._proxy_route()
+                if route:
+                    self._proxy(*route)
+                else:
+                    self.send_error(HTTPStatus.NOT_IMPLEMENTED, f"Unsupported method ({self.command!r})")
+
+            do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _proxy_only
         handler = LoggingHandler
         try:
-            self.server = socketserver.TCPServer(("", self.port), handler)
+            proxy_routes = self._create_proxy_routes()
+            self.server = ThrottledTCPServer(("", self.port), handler, max_connections=self.max_connections,
+                                             bandwidth_limit=self.bandwidth_limit * 1024)
             self.server.site_id = self.id
+            self.server.proxy_routes = proxy_routes
+            for pool in self.upstream_pools.values():
+                pool.start_health_checks()
             self.server_thread = threading.Thread(target=self.server.serve_forever)
             self.server_thread.daemon = True
             self.server_thread.start()
             self.is_running = True
             return True
         except Exception as e:
+            for pool in self.upstream_pools.values():
+                pool.close()
+            self.upstream_pools = {}
             print(f"Error starting server: {e}")
             return False
     
@@ -123,14 +654,39 @@ class WebSite:
         if not self.is_running:
             return False
         try:
+            self.stop_profiling()
             self.server.shutdown()
             self.server.server_close()
+            for pool in self.upstream_pools.values():
+                pool.close()
+            self.upstream_pools = {}
             self.is_running = False
             return True
         except Exception as e:
             print(f"Error stopping server: {e}")
             return False
     
+    def set_limits(self, max_connections: int, bandwidth_limit: int):
+        # Set the connection cap and per-client KB/s limit, applying them to the live server
+        self.max_connections = max_connections
+        self.bandwidth_limit = bandwidth_limit
+        if self.is_running:
+            self.server.set_limits(max_connections, bandwidth_limit * 1024)
+
+    def start_profiling(self, duration: float) -> Optional[SiteProfiler]:
+        # Sample-profile the serving threads for the given number of seconds
+        if not self.is_running or (self.profiler and self.profiler.is_running):
+            return None
+        filename = f"site_{self.id}_{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        self.profiler = SiteProfiler(self.server, os.path.join(PROFILES_DIR, filename), duration)
+        self.profiler.start()
+        return self.profiler
+
+    def stop_profiling(self):
+        # Stop a running profiler early, saving what was sampled so far
+        if self.profiler and self.profiler.is_running:
+            self.profiler.stop()
+
     def get_url(self) -> str:
         # Get the URL for the website
         return f"http://{self.hostname}:{self.port}"
@@ -289,6 +845,52 @@ class LocalHostApp(ctk.CTk):
                                       command=lambda: os.startfile(site.path) if sys.platform == 'win32' else os.system(f'open "{site.path}"'))
         open_folder_btn.grid(row=0, column=1, padx=0, pady=0)
         row += 1
+        proxy_label = ctk.CTkLabel(self.site_details_frame, text="Proxy Rules:")
+        proxy_label.grid(row=row, column=0, padx=20, pady=10, sticky="w")
+        proxy_frame = ctk.CTkFrame(self.site_details_frame)
+        proxy_frame.grid(row=row, column=1, padx=20, pady=10, sticky="ew")
+        proxy_frame.grid_columnconfigure(0, weight=3)
+        proxy_frame.grid_columnconfigure(1, weight=1)
+        proxy_text = "\n".join(f"{prefix} → {target}" for prefix, target in site.proxy_rules) or "None"
+        proxy_value = ctk.CTkLabel(proxy_frame, text=proxy_text, justify="left")
+        proxy_value.grid(row=0, column=0, padx=(0, 10), pady=0, sticky="w")
+        edit_proxy_btn = ctk.CTkButton(proxy_frame, text="Edit", width=70, command=lambda: self._edit_proxy_rules(site.id))
+        edit_proxy_btn.grid(row=0, column=1, padx=0, pady=0)
+        row += 1
+        limits_label = ctk.CTkLabel(self.site_details_frame, text="Limits:")
+        limits_label.grid(row=row, column=0, padx=20, pady=10, sticky="w")
+        limits_frame = ctk.CTkFrame(self.site_details_frame)
+        limits_frame.grid(row=row, column=1, padx=20, pady=10, sticky="w")
+        ctk.CTkLabel(limits_frame, text="Max Connections:").pack(side="left")
+        max_conn_entry = ctk.CTkEntry(limits_frame, width=50)
+        max_conn_entry.insert(0, str(site.max_connections))
+        max_conn_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(limits_frame, text="KB/s per Client:").pack(side="left")
+        bandwidth_entry = ctk.CTkEntry(limits_frame, width=60)
+        bandwidth_entry.insert(0, str(site.bandwidth_limit))
+        bandwidth_entry.pack(side="left", padx=5)
+        apply_limits_btn = ctk.CTkButton(limits_frame, text="Apply", width=70,
+                                         command=lambda: self._apply_site_limits(site.id, max_conn_entry.get(), bandwidth_entry.get()))
+        apply_limits_btn.pack(side="left", padx=5)
+        row += 1
+        profile_label = ctk.CTkLabel(self.site_details_frame, text="Profiling:")
+        profile_label.grid(row=row, column=0, padx=20, pady=10, sticky="w")
+        profile_frame = ctk.CTkFrame(self.site_details_frame)
+        profile_frame.grid(row=row, column=1, padx=20, pady=10, sticky="w")
+        ctk.CTkLabel(profile_frame, text="Seconds:").pack(side="left")
+        profile_entry = ctk.CTkEntry(profile_frame, width=50)
+        profile_entry.insert(0, "10")
+        profile_entry.pack(side="left", padx=5)
+        profile_switch = ctk.CTkSwitch(
+            profile_frame,
+            text="Profile",
+            state="normal" if site.is_running else "disabled",
+            command=lambda: self._toggle_profiling(site.id, profile_entry.get())
+        )
+        if site.profiler and site.profiler.is_running:
+            profile_switch.select()
+        profile_switch.pack(side="left", padx=5)
+        row += 1
         separator = ctk.CTkFrame(self.site_details_frame, height=2, fg_color=("gray70", "gray30"))
         separator.grid(row=row, column=0, columnspan=2, padx=20, pady=20, sticky="ew")
         row += 1
@@ -355,6 +957,89 @@ class LocalHostApp(ctk.CTk):
             if self.selected_site_id == site_id:
                 self._update_site_details(site)
     
+    def _restart_site(self, site: WebSite):
+        # Restart a running site to apply new configuration, reporting if it fails to come back
+        if not site.is_running:
+            return
+        site.stop()
+        if not site.start():
+            self.log_site(site.id, f"[ERROR] Site {site.name} failed to restart at {__import__('datetime').datetime.now()}")
+            messagebox.showerror("Error", f"Failed to restart site '{site.name}' on port {site.port}.")
+
+    def _edit_proxy_rules(self, site_id: str):
+        # Edit a site's reverse-proxy rules, restarting it if running
+        if site_id not in self.websites:
+            return
+        site = self.websites[site_id]
+        dialog = ctk.CTkInputDialog(
+            text="Enter proxy rules as prefix=host:port, separated by commas\n(e.g. /api/*=127.0.0.1:5000). Leave empty to remove all:",
+            title="Proxy Rules"
+        )
+        spec = dialog.get_input()
+        if spec is None:
+            return
+        try:
+            rules = WebSite.parse_proxy_rules(spec)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        site.proxy_rules = rules
+        self.log_site(site_id, f"[PROXY] Rules set to {rules} at {__import__('datetime').datetime.now()}")
+        self._restart_site(site)
+        self._update_sites_list()
+        if self.selected_site_id == site_id:
+            self._update_site_details(site)
+
+    def _apply_site_limits(self, site_id: str, max_connections: str, bandwidth_limit: str):
+        # Set a site's connection cap and per-client bandwidth limit
+        if site_id not in self.websites:
+            return
+        site = self.websites[site_id]
+        try:
+            max_connections, bandwidth_limit = int(max_connections), int(bandwidth_limit)
+            if max_connections < 0 or bandwidth_limit < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Limits must be whole numbers (0 means unlimited).")
+            return
+        site.set_limits(max_connections, bandwidth_limit)
+        self.log_site(site_id, f"[LIMITS] Max connections {max_connections}, {bandwidth_limit} KB/s per client at {__import__('datetime').datetime.now()}")
+        if self.selected_site_id == site_id:
+            self._update_site_details(site)
+
+    def _toggle_profiling(self, site_id: str, seconds: str):
+        # Start or stop sample-profiling a site's serving threads
+        if site_id not in self.websites:
+            return
+        site = self.websites[site_id]
+        if site.profiler and site.profiler.is_running:
+            site.stop_profiling()
+            return
+        try:
+            duration = float(seconds)
+            if duration <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Profiling duration must be a positive number of seconds.")
+            self._update_site_details(site)
+            return
+        profiler = site.start_profiling(duration)
+        if profiler:
+            self.log_site(site_id, f"[PROFILE] Profiling {site.name} for {duration:g}s at {__import__('datetime').datetime.now()}")
+            self._watch_profiler(site_id, profiler)
+
+    def _watch_profiler(self, site_id: str, profiler: SiteProfiler):
+        # Poll a running profiler and log where its output was saved
+        if profiler.is_running:
+            self.after(500, lambda: self._watch_profiler(site_id, profiler))
+            return
+        if profiler.error:
+            self.log_site(site_id, f"[PROFILE] Failed to save profile: {profiler.error}")
+        else:
+            self.log_site(site_id, f"[PROFILE] {profiler.samples} samples saved to {profiler.output_path}")
+        if self.selected_site_id == site_id and site_id in self.websites:
+            self._update_site_details(self.websites[site_id])
+
     def _delete_site(self, site_id: str):
         # Delete a site from the app
         if site_id in self.websites:
@@ -584,6 +1269,20 @@ class SettingsDialog(ctk.CTkToplevel):
         self.cors_origins_entry = ctk.CTkEntry(cors_frame, width=120)
         self.cors_origins_entry.insert(0, self.settings.cors_origins)
         self.cors_origins_entry.pack(side="left", padx=5)
+        proxy_frame = ctk.CTkFrame(self.main_frame)
+        proxy_frame.pack(fill="x", padx=20, pady=5)
+        ctk.CTkLabel(proxy_frame, text="Proxy Timeout (s):").pack(side="left")
+        self.proxy_timeout_entry = ctk.CTkEntry(proxy_frame, width=50)
+        self.proxy_timeout_entry.insert(0, str(self.settings.proxy_timeout))
+        self.proxy_timeout_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(proxy_frame, text="Pool Size:").pack(side="left")
+        self.proxy_pool_entry = ctk.CTkEntry(proxy_frame, width=50)
+        self.proxy_pool_entry.insert(0, str(self.settings.proxy_pool_size))
+        self.proxy_pool_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(proxy_frame, text="Health Check (s):").pack(side="left")
+        self.proxy_health_entry = ctk.CTkEntry(proxy_frame, width=50)
+        self.proxy_health_entry.insert(0, str(self.settings.proxy_health_interval))
+        self.proxy_health_entry.pack(side="left", padx=5)
         section3 = ctk.CTkLabel(self.main_frame, text="UI Settings", font=ctk.CTkFont(size=14, weight="bold"))
         section3.pack(pady=(20, 5), anchor="w", padx=20)
         mode_frame = ctk.CTkFrame(self.main_frame)
@@ -616,6 +1315,9 @@ class SettingsDialog(ctk.CTkToplevel):
 
     def save_settings(self):
         # Save all settings from UI to the settings object
+        if int(self.proxy_timeout_entry.get()) <= 0 or int(self.proxy_pool_entry.get()) <= 0:
+            messagebox.showerror("Error", "Proxy timeout and pool size must be greater than 0.", parent=self)
+            return
         self.settings.default_port_range = (int(self.port_min.get()), int(self.port_max.get()))
         self.settings.default_site_dir = self.site_dir.get()
         self.settings.default_browser = self.browser_entry.get()
@@ -625,6 +1327,9 @@ class SettingsDialog(ctk.CTkToplevel):
         self.settings.server_timeout = int(self.timeout_entry.get())
         self.settings.cors_enabled = self.cors_var.get()
         self.settings.cors_origins = self.cors_origins_entry.get()
+        self.settings.proxy_timeout = int(self.proxy_timeout_entry.get())
+        self.settings.proxy_pool_size = int(self.proxy_pool_entry.get())
+        self.settings.proxy_health_interval = int(self.proxy_health_entry.get())
         self.settings.appearance_mode = self.mode_var.get()
         self.settings.ui_scaling = float(self.scaling_entry.get())
         self.settings.font_size = int(self.font_entry.get())